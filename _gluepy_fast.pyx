@@ -0,0 +1,197 @@
+# cython: language_level=3
+"""
+Optional compiled decoder for gluepy.
+
+Walks glue_value / glue_payload structures through typed pointers instead of
+ctypes field descriptors. gluepy imports it when it has been built and falls
+back to its pure-Python readers otherwise.
+
+Build in place with:
+    cythonize -i _gluepy_fast.pyx
+"""
+
+from libc.stdint cimport uintptr_t
+
+
+# Layouts mirror GlueValueUnion, GlueValue, GlueArg and GluePayload in gluepy.py
+cdef union glue_value_data:
+    unsigned char b
+    int i
+    long long l
+    double d
+    const char* s
+    unsigned char* bb
+    int* ii
+    long long* ll
+    double* dd
+    const char** ss
+    void* composite
+    void* tuple
+
+cdef struct glue_value:
+    glue_value_data data
+    int type
+    int len
+
+cdef struct glue_arg:
+    const char* name
+    glue_value value
+
+cdef struct glue_payload:
+    void* reader
+    const char* origin
+    int status
+    glue_arg* args
+    int args_len
+
+
+cdef enum:
+    GLUE_BOOL = 1
+    GLUE_INT = 2
+    GLUE_LONG = 3
+    GLUE_DOUBLE = 4
+    GLUE_STRING = 5
+    GLUE_TUPLE = 7
+    GLUE_COMPOSITE = 8
+    GLUE_COMPOSITE_ARRAY = 9
+
+
+cdef inline object _str(const char* s):
+    if s == NULL:
+        return None
+    return s.decode("utf-8")
+
+
+cdef object _translate_array(glue_value* v):
+    cdef int i
+    cdef int n = v.len
+    if v.type == GLUE_BOOL:
+        return [v.data.bb[i] != 0 for i in range(n)]
+    if v.type == GLUE_INT:
+        return [v.data.ii[i] for i in range(n)]
+    if v.type == GLUE_LONG:
+        return [v.data.ll[i] for i in range(n)]
+    if v.type == GLUE_DOUBLE:
+        return [v.data.dd[i] for i in range(n)]
+    if v.type == GLUE_STRING:
+        return [_str(v.data.ss[i]) for i in range(n)]
+    return None
+
+
+cdef object _translate_leaf(glue_value* v):
+    if v.len >= 0:
+        return _translate_array(v)
+    if v.type == GLUE_BOOL:
+        return v.data.b != 0
+    if v.type == GLUE_INT:
+        return v.data.i
+    if v.type == GLUE_LONG:
+        return v.data.l
+    if v.type == GLUE_DOUBLE:
+        return v.data.d
+    if v.type == GLUE_STRING:
+        return _str(v.data.s)
+    return None
+
+
+# Nesting depth decoded by C recursion; deeper subtrees go to the explicit
+# work stack so they cannot overflow small (e.g. CLR callback) thread stacks
+cdef enum:
+    MAX_RECURSION_DEPTH = 256
+
+
+cdef object _translate(glue_value* v, int depth):
+    cdef int i
+    cdef glue_arg* args
+    cdef glue_value* values
+
+    if depth >= MAX_RECURSION_DEPTH:
+        return _translate_iterative(v)
+    depth += 1
+
+    if v.type == GLUE_TUPLE:
+        if v.data.tuple == NULL:
+            return None
+        values = <glue_value*>v.data.tuple
+        return [_translate(&values[i], depth) for i in range(v.len)]
+    if v.type == GLUE_COMPOSITE:
+        if v.data.composite == NULL:
+            return {}
+        args = <glue_arg*>v.data.composite
+        return {_str(args[i].name): _translate(&args[i].value, depth)
+                for i in range(v.len)}
+    if v.type == GLUE_COMPOSITE_ARRAY:
+        if v.data.composite == NULL:
+            return None
+        args = <glue_arg*>v.data.composite
+        return [_translate(&args[i].value, depth) for i in range(v.len)]
+    return _translate_leaf(v)
+
+
+cdef object _translate_iterative(glue_value* root_value):
+    # Same walk as gluepy.translate_glue_value: each stack entry is
+    # (container, key, address)
+    cdef int i
+    cdef glue_value* v
+    cdef glue_arg* args
+    cdef glue_value* values
+
+    root = [None]
+    stack = [(root, 0, <uintptr_t>root_value)]
+    while stack:
+        container, key, address = stack.pop()
+        v = <glue_value*><uintptr_t>address
+
+        if v.type == GLUE_TUPLE:
+            if v.data.tuple == NULL:
+                container[key] = None
+                continue
+            values = <glue_value*>v.data.tuple
+            child = [None] * v.len
+            container[key] = child
+            for i in range(v.len):
+                stack.append((child, i, <uintptr_t>&values[i]))
+        elif v.type == GLUE_COMPOSITE:
+            if v.data.composite == NULL:
+                container[key] = {}
+                continue
+            args = <glue_arg*>v.data.composite
+            names = [_str(args[i].name) for i in range(v.len)]
+            child = dict.fromkeys(names)
+            container[key] = child
+            for i in range(v.len):
+                stack.append((child, names[i], <uintptr_t>&args[i].value))
+        elif v.type == GLUE_COMPOSITE_ARRAY:
+            if v.data.composite == NULL:
+                container[key] = None
+                continue
+            args = <glue_arg*>v.data.composite
+            child = [None] * v.len
+            container[key] = child
+            for i in range(v.len):
+                stack.append((child, i, <uintptr_t>&args[i].value))
+        else:
+            container[key] = _translate_leaf(v)
+    return root[0]
+
+
+def translate_value(uintptr_t address):
+    """
+    Converts the glue_value at `address` to a Python-friendly object.
+    """
+    return _translate(<glue_value*>address, 0)
+
+
+def translate_payload(uintptr_t address):
+    """
+    Converts the glue_payload at `address` to a dictionary of its arguments.
+    """
+    cdef glue_payload* payload = <glue_payload*>address
+    cdef int i
+    result = {}
+    for i in range(payload.args_len):
+        name = _str(payload.args[i].name)
+        if name is None:
+            name = f"arg_{i}"
+        result[name] = _translate(&payload.args[i].value, 0)
+    return result
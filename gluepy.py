@@ -1,12 +1,22 @@
 
-from threading import Lock
+from threading import Lock, local
 import asyncio
 import ctypes
-from ctypes import cast, POINTER, Structure, CFUNCTYPE, c_int, c_char_p, c_bool, c_double, c_longlong, c_void_p, c_uint32
+import functools
+import itertools
+from ctypes import addressof, cast, POINTER, Structure, CFUNCTYPE, c_int, c_char_p, c_bool, c_double, c_longlong, c_void_p, c_uint32
 import os
+import sys
 
 from _ctypes import Union, byref
 
+# Optional compiled decoder (see _gluepy_fast.pyx); pure Python is used if it
+# has not been built
+try:
+    import _gluepy_fast
+except ImportError:
+    _gluepy_fast = None
+
 # Enums
 
 
@@ -38,6 +48,10 @@ class GlueType(ctypes.c_int):
     glue_composite = 8
     glue_composite_array = 9
 
+# Plain int aliases of the GlueType ids, for hot-path comparisons and stores
+(GLUE_NONE, GLUE_BOOL, GLUE_INT, GLUE_LONG, GLUE_DOUBLE, GLUE_STRING,
+ GLUE_DATETIME, GLUE_TUPLE, GLUE_COMPOSITE, GLUE_COMPOSITE_ARRAY) = range(10)
+
 # union for glue_value
 
 
@@ -100,142 +114,197 @@ ContextFunction = CFUNCTYPE(
     None, c_char_p, c_char_p, POINTER(GlueValue), c_void_p)
 AppCallbackFunction = CFUNCTYPE(
     None, c_int, c_void_p, POINTER(GluePayload), c_void_p)
+InvokeAllCallback = CFUNCTYPE(
+    None, c_char_p, c_void_p, POINTER(GluePayload), c_int)
+
+
+class LazyCDLL:
+    """
+    Loads a DLL and configures its function prototypes on first attribute
+    access, so importing gluepy does not require the DLL.
+    """
+
+    def __init__(self, name, configure):
+        self._name = name
+        self._configure = configure
+        self._lib = None
+        self._lock = Lock()
+        self._search_path_added = False
+
+    def _add_search_path(self):
+        # Add the current folder to the DLL search path, once; failed loads
+        # are retried and must not extend PATH again each time
+        if self._search_path_added:
+            return
+        if hasattr(os, "add_dll_directory"):
+            self._dll_directory = os.add_dll_directory(os.getcwd())
+        else:
+            os.environ["PATH"] += os.pathsep + os.getcwd()
+        self._search_path_added = True
+
+    def _load(self):
+        with self._lock:
+            if self._lib is None:
+                self._add_search_path()
+                lib = ctypes.CDLL(os.path.join(os.getcwd(), self._name))
+                self._configure(lib)
+                self._lib = lib
+        return self._lib
+
+    def __getattr__(self, name):
+        value = getattr(self._lib or self._load(), name)
+        # Later lookups find the function on the proxy without __getattr__
+        setattr(self, name, value)
+        return value
+
 
-# Add the current folder to the DLL search path
-if hasattr(os, "add_dll_directory"):
-    os.add_dll_directory(os.getcwd())
-else:
-    os.environ["PATH"] += os.pathsep + os.getcwd()
+def _configure_prototypes(lib):
+    # Function prototypes
+    lib.glue_ensure_clr_.argtypes = [
+        ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
+    lib.glue_ensure_clr_.restype = ctypes.c_int
 
-# Load DLL
-dll_path = os.path.join(os.getcwd(), "GlueCLILib.dll")
-glue_lib = ctypes.CDLL(dll_path)
+    lib.glue_init.argtypes = [c_char_p, GlueInitCallback, c_void_p]
+    lib.glue_init.restype = c_int
 
-# Function prototypes
-glue_lib.glue_ensure_clr_.argtypes = [
-    ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
-glue_lib.glue_ensure_clr_.restype = ctypes.c_int
+    lib.glue_subscribe_endpoints_status.argtypes = [
+        GlueEndpointStatusCallback, c_void_p]
+    lib.glue_subscribe_endpoints_status.restype = c_void_p
 
-glue_lib.glue_init.argtypes = [c_char_p, GlueInitCallback, c_void_p]
-glue_lib.glue_init.restype = c_int
+    lib.glue_set_save_state.argtypes = [InvocationCallback, c_void_p]
+    lib.glue_set_save_state.restype = c_int
 
-glue_lib.glue_subscribe_endpoints_status.argtypes = [
-    GlueEndpointStatusCallback, c_void_p]
-glue_lib.glue_subscribe_endpoints_status.restype = c_void_p
+    lib.glue_register_window.argtypes = [
+        c_void_p, GlueWindowCallback, c_char_p, c_void_p, c_bool]
+    lib.glue_register_window.restype = c_void_p
 
-glue_lib.glue_set_save_state.argtypes = [InvocationCallback, c_void_p]
-glue_lib.glue_set_save_state.restype = c_int
+    lib.glue_register_main_window.argtypes = [
+        c_void_p, AppCallbackFunction, GlueWindowCallback, c_char_p, c_void_p]
+    lib.glue_register_main_window.restype = c_void_p
 
-glue_lib.glue_register_window.argtypes = [
-    c_void_p, GlueWindowCallback, c_char_p, c_void_p, c_bool]
-glue_lib.glue_register_window.restype = c_void_p
+    lib.glue_is_launched_by_gd.restype = c_bool
 
-glue_lib.glue_register_main_window.argtypes = [
-    c_void_p, AppCallbackFunction, GlueWindowCallback, c_char_p, c_void_p]
-glue_lib.glue_register_main_window.restype = c_void_p
+    lib.glue_get_starting_context_reader.restype = c_void_p
 
-glue_lib.glue_is_launched_by_gd.restype = c_bool
+    lib.glue_register_endpoint.argtypes = [
+        c_char_p, InvocationCallback, c_void_p]
+    lib.glue_register_endpoint.restype = c_int
 
-glue_lib.glue_get_starting_context_reader.restype = c_void_p
+    lib.glue_register_streaming_endpoint.argtypes = [
+        c_char_p, StreamCallback, InvocationCallback, c_void_p]
+    lib.glue_register_streaming_endpoint.restype = c_void_p
 
-glue_lib.glue_register_endpoint.argtypes = [
-    c_char_p, InvocationCallback, c_void_p]
-glue_lib.glue_register_endpoint.restype = c_int
+    lib.glue_open_streaming_branch.argtypes = [c_void_p, c_char_p]
+    lib.glue_open_streaming_branch.restype = c_void_p
 
-glue_lib.glue_register_streaming_endpoint.argtypes = [
-    c_char_p, StreamCallback, InvocationCallback, c_void_p]
-glue_lib.glue_register_streaming_endpoint.restype = c_void_p
+    lib.glue_invoke.argtypes = [c_char_p, POINTER(
+        GlueArg), c_int, PayloadFunction, c_void_p]
+    lib.glue_invoke.restype = c_int
 
-glue_lib.glue_open_streaming_branch.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_open_streaming_branch.restype = c_void_p
+    lib.glue_invoke_all.argtypes = [
+        c_char_p, POINTER(GlueArg), c_int, InvokeAllCallback, c_void_p]
+    lib.glue_invoke_all.restype = c_int
 
-glue_lib.glue_invoke.argtypes = [c_char_p, POINTER(
-    GlueArg), c_int, PayloadFunction, c_void_p]
-glue_lib.glue_invoke.restype = c_int
+    lib.glue_gc.restype = c_int
 
-glue_lib.glue_invoke_all.argtypes = [c_char_p, POINTER(GlueArg), c_int, CFUNCTYPE(
-    None, c_char_p, c_void_p, POINTER(GluePayload), c_int), c_void_p]
-glue_lib.glue_invoke_all.restype = c_int
+    lib.glue_get_value_reader.argtypes = [GlueValue]
+    lib.glue_get_value_reader.restype = c_void_p
 
-glue_lib.glue_gc.restype = c_int
+    lib.glue_read_json.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_json.restype = c_char_p
 
-glue_lib.glue_get_value_reader.argtypes = [GlueValue]
-glue_lib.glue_get_value_reader.restype = c_void_p
+    lib.glue_read_glue_value.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_glue_value.restype = GlueValue
 
-glue_lib.glue_read_json.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_json.restype = c_char_p
+    lib.glue_read_b.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_b.restype = c_bool
 
-glue_lib.glue_read_glue_value.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_glue_value.restype = GlueValue
+    lib.glue_read_i.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_i.restype = c_int
 
-glue_lib.glue_read_b.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_b.restype = c_bool
+    lib.glue_read_l.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_l.restype = c_longlong
 
-glue_lib.glue_read_i.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_i.restype = c_int
+    lib.glue_read_d.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_d.restype = c_double
 
-glue_lib.glue_read_l.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_l.restype = c_longlong
+    lib.glue_read_s.argtypes = [c_void_p, c_char_p]
+    lib.glue_read_s.restype = c_char_p
 
-glue_lib.glue_read_d.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_d.restype = c_double
+    lib.glue_read_context.argtypes = [
+        c_char_p, c_char_p, ContextFunction, c_void_p]
+    lib.glue_read_context.restype = c_int
 
-glue_lib.glue_read_s.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_read_s.restype = c_char_p
+    lib.glue_read_context_sync.argtypes = [c_char_p]
+    lib.glue_read_context_sync.restype = c_void_p
 
-glue_lib.glue_read_context.argtypes = [
-    c_char_p, c_char_p, ContextFunction, c_void_p]
-glue_lib.glue_read_context.restype = c_int
+    lib.glue_write_context.argtypes = [c_char_p, c_char_p, GlueValue, c_bool]
+    lib.glue_write_context.restype = c_void_p
 
-glue_lib.glue_read_context_sync.argtypes = [c_char_p]
-glue_lib.glue_read_context_sync.restype = c_void_p
+    lib.glue_get_context_writer.argtypes = [c_char_p, c_char_p]
+    lib.glue_get_context_writer.restype = c_void_p
 
-glue_lib.glue_write_context.argtypes = [c_char_p, c_char_p, GlueValue, c_bool]
-glue_lib.glue_write_context.restype = c_void_p
+    lib.glue_push_payload.argtypes = [
+        c_void_p, POINTER(GlueArg), c_int, c_bool]
+    lib.glue_push_payload.restype = c_void_p
 
-glue_lib.glue_get_context_writer.argtypes = [c_char_p, c_char_p]
-glue_lib.glue_get_context_writer.restype = c_void_p
+    lib.glue_push_json_payload.argtypes = [c_void_p, c_char_p, c_bool]
+    lib.glue_push_json_payload.restype = c_void_p
 
-glue_lib.glue_push_payload.argtypes = [
-    c_void_p, POINTER(GlueArg), c_int, c_bool]
-glue_lib.glue_push_payload.restype = c_void_p
+    lib.glue_push_failure.argtypes = [c_void_p, c_char_p]
+    lib.glue_push_failure.restype = c_int
 
-glue_lib.glue_push_json_payload.argtypes = [c_void_p, c_char_p, c_bool]
-glue_lib.glue_push_json_payload.restype = c_void_p
+    lib.glue_subscribe_context.argtypes = [
+        c_char_p, c_char_p, ContextFunction, c_void_p]
+    lib.glue_subscribe_context.restype = c_void_p
 
-glue_lib.glue_push_failure.argtypes = [c_void_p, c_char_p]
-glue_lib.glue_push_failure.restype = c_int
+    lib.glue_subscribe_stream.argtypes = [
+        c_char_p, PayloadFunction, POINTER(GlueArg), c_int, c_void_p]
+    lib.glue_subscribe_stream.restype = c_void_p
 
-glue_lib.glue_subscribe_context.argtypes = [
-    c_char_p, c_char_p, ContextFunction, c_void_p]
-glue_lib.glue_subscribe_context.restype = c_void_p
+    lib.glue_subscribe_single_stream.argtypes = [
+        c_char_p, PayloadFunction, POINTER(GlueArg), c_int, c_void_p]
+    lib.glue_subscribe_single_stream.restype = c_void_p
 
-glue_lib.glue_subscribe_stream.argtypes = [
-    c_char_p, PayloadFunction, POINTER(GlueArg), c_int, c_void_p]
-glue_lib.glue_subscribe_stream.restype = c_void_p
+    lib.glue_app_register_factory.argtypes = [
+        c_char_p, AppCallbackFunction, c_char_p, c_void_p]
+    lib.glue_app_register_factory.restype = c_void_p
 
-glue_lib.glue_subscribe_single_stream.argtypes = [
-    c_char_p, PayloadFunction, POINTER(GlueArg), c_int, c_void_p]
-glue_lib.glue_subscribe_single_stream.restype = c_void_p
+    lib.glue_app_announce_instance.argtypes = [
+        c_void_p, c_void_p, AppCallbackFunction, GlueWindowCallback, c_void_p]
+    lib.glue_app_announce_instance.restype = c_int
 
-glue_lib.glue_app_register_factory.argtypes = [
-    c_char_p, AppCallbackFunction, c_char_p, c_void_p]
-glue_lib.glue_app_register_factory.restype = c_void_p
+    lib.glue_raise_simple_notification.argtypes = [
+        c_char_p, c_char_p, GlueNotificationSeverity, c_void_p]
+    lib.glue_raise_simple_notification.restype = c_int
 
-glue_lib.glue_app_announce_instance.argtypes = [
-    c_void_p, c_void_p, AppCallbackFunction, GlueWindowCallback, c_void_p]
-glue_lib.glue_app_announce_instance.restype = c_int
+    lib.glue_destroy_resource.argtypes = [c_void_p]
+    lib.glue_destroy_resource.restype = c_int
 
-glue_lib.glue_raise_simple_notification.argtypes = [
-    c_char_p, c_char_p, GlueNotificationSeverity, c_void_p]
-glue_lib.glue_raise_simple_notification.restype = c_int
+    lib.glue_read_async_result.argtypes = [
+        c_void_p, POINTER(POINTER(GlueValue)), c_uint32]
+    lib.glue_read_async_result.restype = c_int
 
-glue_lib.glue_destroy_resource.argtypes = [c_void_p]
-glue_lib.glue_destroy_resource.restype = c_int
 
-glue_lib.glue_read_async_result.argtypes = [
-    c_void_p, POINTER(POINTER(GlueValue)), c_uint32]
-glue_lib.glue_read_async_result.restype = c_int
+glue_lib = LazyCDLL("GlueCLILib.dll", _configure_prototypes)
+
+
+@functools.lru_cache(maxsize=4096)
+def _u8(name):
+    """
+    UTF-8 encodes a name (endpoint, context, field path or argument key).
+    Names recur on every call, so their encodings are cached.
+    """
+    return name.encode("utf-8")
+
+
+@functools.lru_cache(maxsize=8192)
+def _name_str(name):
+    """
+    Decodes an argument or field name. Names repeat across payloads, so the
+    interned results are cached and later dict lookups compare by identity.
+    """
+    return sys.intern(name.decode("utf-8"))
 
 
 def glue_ensure_clr(version=None, build_flavor=None, assembly=None):
@@ -268,69 +337,93 @@ def get_glue_type_name(value_type):
     return glue_type_names.get(value_type, f"Unknown({value_type})")
 
 
+# Element pointer types for walking composites and tuples. Slicing a typed
+# pointer avoids building a sized (GlueArg * n) array type per length.
+_GlueArgPtr = POINTER(GlueArg)
+_GlueValuePtr = POINTER(GlueValue)
+
+
+# Container openers for translate_glue_value. Each returns the empty Python
+# container and the (key, child glue_value) pairs that still need decoding.
+def _open_composite(glue_value):
+    if not glue_value.data.composite:
+        return {}, ()
+    composite = cast(glue_value.data.composite, _GlueArgPtr)
+    children = [(_name_str(c.name), c.value)
+                for c in composite[:glue_value.len]]
+    return dict.fromkeys(name for name, _ in children), children
+
+
+def _open_tuple(glue_value):
+    if not glue_value.data.tuple:
+        return None, ()
+    tuple_values = cast(glue_value.data.tuple, _GlueValuePtr)
+    children = list(enumerate(tuple_values[:glue_value.len]))
+    return [None] * len(children), children
+
+
+def _open_composite_array(glue_value):
+    if not glue_value.data.composite:
+        return None, ()
+    composite_array = cast(glue_value.data.composite, _GlueArgPtr)
+    children = list(enumerate(
+        c.value for c in composite_array[:glue_value.len]))
+    return [None] * len(children), children
+
+
+_CONTAINER_OPENERS = {
+    GLUE_TUPLE: _open_tuple,
+    GLUE_COMPOSITE: _open_composite,
+    GLUE_COMPOSITE_ARRAY: _open_composite_array,
+}
+
+# Type id -> reader dispatch tables for translate_glue_value. Scalars carry
+# len == -1; arrays (including empty ones) carry len >= 0.
+_READERS = {
+    GLUE_BOOL: lambda v: v.data.b,
+    GLUE_INT: lambda v: v.data.i,
+    GLUE_LONG: lambda v: v.data.l,
+    GLUE_DOUBLE: lambda v: v.data.d,
+    GLUE_STRING: lambda v: v.data.s.decode("utf-8") if v.data.s else None,
+}
+
+_ARRAY_READERS = {
+    # Slicing a ctypes pointer builds the list in a single C loop
+    GLUE_BOOL: lambda v: v.data.bb[:v.len],
+    GLUE_INT: lambda v: v.data.ii[:v.len],
+    GLUE_LONG: lambda v: v.data.ll[:v.len],
+    GLUE_DOUBLE: lambda v: v.data.dd[:v.len],
+    GLUE_STRING: lambda v: [
+        s.decode("utf-8") if s else None for s in v.data.ss[:v.len]],
+}
+
+
 def translate_glue_value(glue_value):
     """
     Converts a glue_value to a Python-friendly object.
     """
-    value = None
-
-    # Handle scalar types
-    if glue_value.type == GlueType.glue_bool:
-        value = glue_value.data.b
-    elif glue_value.type == GlueType.glue_int:
-        value = glue_value.data.i
-    elif glue_value.type == GlueType.glue_long:
-        value = glue_value.data.l
-    elif glue_value.type == GlueType.glue_double:
-        value = glue_value.data.d
-    elif glue_value.type == GlueType.glue_string:
-        value = glue_value.data.s.decode(
-            "utf-8") if glue_value.data.s else None
-
-    # Handle arrays (support empty arrays as well)
-    elif glue_value.type == GlueType.glue_bool and glue_value.len >= 0:
-        value = [glue_value.data.bb[i] for i in range(glue_value.len)]
-    elif glue_value.type == GlueType.glue_int and glue_value.len >= 0:
-        value = [glue_value.data.ii[i] for i in range(glue_value.len)]
-    elif glue_value.type == GlueType.glue_long and glue_value.len >= 0:
-        value = [glue_value.data.ll[i] for i in range(glue_value.len)]
-    elif glue_value.type == GlueType.glue_double and glue_value.len >= 0:
-        value = [glue_value.data.dd[i] for i in range(glue_value.len)]
-    elif glue_value.type == GlueType.glue_string and glue_value.len >= 0:
-        value = [glue_value.data.ss[i].decode(
-            "utf-8") if glue_value.data.ss[i] else None for i in range(glue_value.len)]
-
-    # Handle composites (dictionary-like)
-    elif glue_value.type == GlueType.glue_composite:
-        if glue_value.data.composite:
-            composite = cast(glue_value.data.composite, POINTER(
-                GlueArg * glue_value.len)).contents
-            value = {c.name.decode("utf-8"): translate_glue_value(c.value)
-                     for c in composite[:glue_value.len]}
-        else:
-            value = {}
-
-    # Handle tuples (list-like)
-    elif glue_value.type == GlueType.glue_tuple:
-        if glue_value.data.tuple:
-            tuple_values = cast(glue_value.data.tuple, POINTER(
-                GlueValue * glue_value.len)).contents
-            value = [translate_glue_value(tv)
-                     for tv in tuple_values[:glue_value.len]]
-        else:
-            value = None
-
-    # Handle composite arrays (list of dictionaries)
-    elif glue_value.type == GlueType.glue_composite_array:
-        if glue_value.data.composite:
-            composite_array = cast(glue_value.data.composite, POINTER(
-                GlueArg * glue_value.len)).contents
-            value = [translate_glue_value(c.value)
-                     for c in composite_array[:glue_value.len]]
-        else:
-            value = None
-
-    return value
+    if _gluepy_fast is not None:
+        return _gluepy_fast.translate_value(addressof(glue_value))
+
+    # Nested values are decoded from an explicit work stack instead of by
+    # recursion, so deep payloads cost no Python frames and cannot hit the
+    # recursion limit. Each entry is (container, key, glue_value).
+    root = [None]
+    stack = [(root, 0, glue_value)]
+    while stack:
+        container, key, value = stack.pop()
+        opener = _CONTAINER_OPENERS.get(value.type)
+        if opener:
+            child_container, children = opener(value)
+            container[key] = child_container
+            # Pushed in reverse so siblings are decoded in order
+            stack.extend((child_container, child_key, child)
+                         for child_key, child in reversed(children))
+            continue
+        readers = _ARRAY_READERS if value.len >= 0 else _READERS
+        reader = readers.get(value.type)
+        container[key] = reader(value) if reader else None
+    return root[0]
 
 
 def payload_to_object(payload):
@@ -338,101 +431,261 @@ def payload_to_object(payload):
     Converts a glue_payload into a Python-friendly object.
     Each glue_arg in the payload becomes a key-value pair in the resulting dictionary.
     """
+    if _gluepy_fast is not None:
+        return _gluepy_fast.translate_payload(addressof(payload))
+
     python_object = {}
     args = payload.args
 
     for i in range(payload.args_len):
         arg = args[i]
-        name = arg.name.decode("utf-8") if arg.name else f"arg_{i}"
+        name = _name_str(arg.name) if arg.name else f"arg_{i}"
         python_object[name] = translate_glue_value(arg.value)
 
     return python_object
 
 
-def object_to_glue_value(py_object):
+_numpy_module = None
+
+
+def _numpy():
     """
-    Translates a Python-native object to a glue_value structure.
-    Supports:
-    - Scalars (int, float, bool, str)
-    - Lists (homogeneous or mixed) - mixed are mapped to tuples
-    - Dictionaries (mapped to glue_composite)
-    - Lists of dictionaries (mapped to glue_composite_array)
+    Returns the numpy module, or None if it is not installed. The import is
+    attempted once, on first use.
+    """
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
+
+def _numeric_array(values, ctype, dtype):
     """
+    Builds a ctypes array of `ctype` from a sequence of numbers.
+
+    With numpy available the conversion loop runs in numpy's C code and the
+    ctypes array is a view over the resulting buffer (from_buffer keeps the
+    ndarray alive). An ndarray that already has the right dtype and layout is
+    shared without a copy, unless it is read-only, since from_buffer needs a
+    writable buffer.
+    """
+    n = len(values)
+    np = _numpy()
+    if np is None:
+        buf = (ctype * n)()
+        buf[:] = values
+        return buf
+    if isinstance(values, np.ndarray):
+        arr = np.ascontiguousarray(values, dtype=dtype)
+        if not arr.flags.writeable:
+            arr = arr.copy()
+    else:
+        arr = np.fromiter(values, dtype=dtype, count=n)
+    return (ctype * n).from_buffer(arr)
+
+
+def _encode_bool(py_object):
     glue_value = GlueValue()
+    glue_value.data.b = py_object
+    glue_value.type = GLUE_BOOL
+    glue_value.len = -1
+    return glue_value
 
-    if not py_object:
-        glue_value.type = GlueType.glue_none
-        glue_value.len = -1
-        return glue_value
 
-    # Handle scalars
-    if isinstance(py_object, bool):
-        glue_value.data.b = py_object
-        glue_value.type = GlueType.glue_bool
-        glue_value.len = -1
-    elif isinstance(py_object, int):
-        glue_value.data.l = py_object
-        glue_value.type = GlueType.glue_long
-        glue_value.len = -1
-    elif isinstance(py_object, float):
-        glue_value.data.d = py_object
-        glue_value.type = GlueType.glue_double
-        glue_value.len = -1
-    elif isinstance(py_object, str):
-        glue_value.data.s = py_object.encode("utf-8")
-        glue_value.type = GlueType.glue_string
-        glue_value.len = -1
+def _encode_int(py_object):
+    glue_value = GlueValue()
+    glue_value.data.l = py_object
+    glue_value.type = GLUE_LONG
+    glue_value.len = -1
+    return glue_value
 
-    # Handle lists (homogeneous or mixed types)
-    elif isinstance(py_object, list):
-        glue_value.len = len(py_object)
-        if all(isinstance(x, bool) for x in py_object):
-            glue_value.data.bb = (c_bool * len(py_object))(*py_object)
-            glue_value.type = GlueType.glue_bool
-        elif all(isinstance(x, int) for x in py_object):
-            glue_value.data.ll = (c_longlong * len(py_object))(*py_object)
-            glue_value.type = GlueType.glue_long
-        elif all(isinstance(x, float) for x in py_object):
-            glue_value.data.dd = (c_double * len(py_object))(*py_object)
-            glue_value.type = GlueType.glue_double
-        elif all(isinstance(x, str) for x in py_object):
-            glue_value.data.ss = (c_char_p * len(py_object)
-                                  )(*(s.encode("utf-8") for s in py_object))
-            glue_value.type = GlueType.glue_string
-        else:
-            # Mixed-type list: Convert each item to a glue_value and treat as a tuple
-            glue_values = (GlueValue * len(py_object))()
-            for i, item in enumerate(py_object):
-                glue_values[i] = object_to_glue_value(item)
-            glue_value.data.tuple = cast(
-                glue_values, c_void_p)  # cast to void*
-            glue_value.type = GlueType.glue_tuple
-
-    # Handle dictionaries (nested maps, composites)
-    elif isinstance(py_object, dict):
-        glue_args = (GlueArg * len(py_object))()
-        for i, (key, value) in enumerate(py_object.items()):
-            glue_args[i].name = key.encode("utf-8")
-            glue_args[i].value = object_to_glue_value(value)
-        glue_value.data.composite = cast(glue_args, c_void_p)  # cast to void*
-        glue_value.type = GlueType.glue_composite
-        glue_value.len = len(py_object)
 
-    # Handle lists of dictionaries (mapped to glue_composite_array)
-    elif isinstance(py_object, list) and all(isinstance(x, dict) for x in py_object):
-        glue_args_array = (GlueArg * len(py_object))()
+def _encode_float(py_object):
+    glue_value = GlueValue()
+    glue_value.data.d = py_object
+    glue_value.type = GLUE_DOUBLE
+    glue_value.len = -1
+    return glue_value
+
+
+def _encode_str(py_object):
+    glue_value = GlueValue()
+    glue_value.data.s = py_object.encode("utf-8")
+    glue_value.type = GLUE_STRING
+    glue_value.len = -1
+    return glue_value
+
+
+# Element types with a dedicated list encoding, in the bool-before-int order
+# used by _find_encoder
+_LIST_ELEMENT_TYPES = (bool, int, float, str, dict)
+
+
+def _list_base_type(py_object):
+    """
+    Returns the _LIST_ELEMENT_TYPES entry shared by every item of a non-empty
+    list, allowing subclasses (numpy scalars, IntEnum members...), or None.
+    """
+    head = py_object[0]
+    for base in _LIST_ELEMENT_TYPES:
+        if isinstance(head, base):
+            break
+    else:
+        return None
+    if base is int:
+        # Bools are ints too, but a mixed list is sent as a tuple
+        if all(isinstance(x, int) and not isinstance(x, bool) for x in py_object):
+            return int
+        return None
+    if all(isinstance(x, base) for x in py_object):
+        return base
+    return None
+
+
+def _encode_list(py_object):
+    glue_value = GlueValue()
+    n = len(py_object)
+    glue_value.len = n
+    # Exact types settle plain lists in one pass; anything else (subclasses or
+    # a mix) is rechecked against the base types
+    head_type = type(py_object[0]) if n else None
+    if head_type not in _LIST_ELEMENT_TYPES or not all(
+            type(x) is head_type for x in py_object):
+        head_type = _list_base_type(py_object) if n else None
+
+    # Slice assignment into a preallocated array avoids the ctypes
+    # varargs constructor; assigning the array to the union field keeps
+    # it alive through the structure's _objects.
+    if head_type is bool:
+        buf = (c_bool * n)()
+        buf[:] = py_object
+        glue_value.data.bb = buf
+        glue_value.type = GLUE_BOOL
+    elif head_type is int:
+        glue_value.data.ll = _numeric_array(py_object, c_longlong, "int64")
+        glue_value.type = GLUE_LONG
+    elif head_type is float:
+        glue_value.data.dd = _numeric_array(py_object, c_double, "float64")
+        glue_value.type = GLUE_DOUBLE
+    elif head_type is str:
+        # The slice assignment records every bytes object in buf._objects,
+        # so the encoded strings live as long as the array the DLL reads
+        encoded = [s.encode("utf-8") for s in py_object]
+        buf = (c_char_p * n)()
+        buf[:] = encoded
+        glue_value.data.ss = buf
+        glue_value.type = GLUE_STRING
+    elif head_type is dict:
+        # List of dictionaries: unnamed GlueArgs holding composites
+        glue_args = (GlueArg * n)()
         for i, item in enumerate(py_object):
-            glue_args_array[i].value = object_to_glue_value(item)
+            glue_args[i].value = object_to_glue_value(item)
         glue_value.data.composite = cast(
-            glue_args_array, c_void_p)  # cast to void*
-        glue_value.type = GlueType.glue_composite_array
+            glue_args, c_void_p)  # cast to void*
+        glue_value.type = GLUE_COMPOSITE_ARRAY
+    else:
+        # Mixed-type list: Convert each item to a glue_value and treat as a tuple
+        glue_values = (GlueValue * n)()
+        for i, item in enumerate(py_object):
+            glue_values[i] = object_to_glue_value(item)
+        glue_value.data.tuple = cast(
+            glue_values, c_void_p)  # cast to void*
+        glue_value.type = GLUE_TUPLE
+    return glue_value
+
+
+def _encode_dict(py_object):
+    glue_value = GlueValue()
+    glue_args = (GlueArg * len(py_object))()
+    for i, (key, value) in enumerate(py_object.items()):
+        glue_args[i].name = _u8(key)
+        glue_args[i].value = object_to_glue_value(value)
+    glue_value.data.composite = cast(glue_args, c_void_p)  # cast to void*
+    glue_value.type = GLUE_COMPOSITE
+    glue_value.len = len(py_object)
+    return glue_value
+
+
+def _encode_ndarray(py_object):
+    glue_value = GlueValue()
+    np = _numpy()
+    kind = py_object.dtype.kind
+    # uint64 does not fit int64; those go through tolist() and fail loudly
+    # like the list path instead of wrapping
+    if py_object.ndim == 1 and (
+            kind == "i" or (kind == "u" and py_object.dtype.itemsize < 8)):
+        glue_value.data.ll = _numeric_array(py_object, c_longlong, np.int64)
+        glue_value.type = GLUE_LONG
         glue_value.len = len(py_object)
+    elif py_object.ndim == 1 and kind == "f":
+        glue_value.data.dd = _numeric_array(py_object, c_double, np.float64)
+        glue_value.type = GLUE_DOUBLE
+        glue_value.len = len(py_object)
+    else:
+        return object_to_glue_value(py_object.tolist())
+    return glue_value
+
+
+# Exact type -> encoder. Looking up type(py_object) skips the isinstance
+# chain and keeps bool from being taken for int. Order matters for the
+# isinstance fallback used with subclasses: bool must precede int.
+_ENCODERS = {
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    list: _encode_list,
+    tuple: _encode_list,
+    dict: _encode_dict,
+}
+
+
+def _find_encoder(py_object):
+    np = _numpy()
+    if np is not None and isinstance(py_object, np.ndarray):
+        return _encode_ndarray
+    for py_type, encoder in _ENCODERS.items():
+        if isinstance(py_object, py_type):
+            return encoder
+    return None
+
+
+def object_to_glue_value(py_object):
+    """
+    Translates a Python-native object to a glue_value structure.
+    Supports:
+    - Scalars (int, float, bool, str)
+    - Lists and tuples (homogeneous or mixed) - mixed are mapped to tuples
+    - Dictionaries (mapped to glue_composite)
+    - Lists of dictionaries (mapped to glue_composite_array)
+    - One-dimensional numpy integer/float arrays (mapped to long/double arrays)
+
+    The returned GlueValue owns every buffer it points to through ctypes'
+    _objects bookkeeping, and copying it into a GlueValue/GlueArg array
+    carries that ownership along. Keeping the top-level value or array alive
+    for the duration of the DLL call is sufficient; no defensive copies are
+    needed.
+    """
+    encoder = _ENCODERS.get(type(py_object))
+    # None is common and needs no fallback lookup (which may import numpy)
+    if encoder is None and py_object is not None:
+        encoder = _find_encoder(py_object)
+
+    if encoder is not _encode_ndarray and not py_object:
+        glue_value = GlueValue()
+        glue_value.type = GLUE_NONE
+        glue_value.len = -1
+        return glue_value
 
     # Unsupported types
-    else:
+    if encoder is None:
         raise ValueError(f"Unsupported Python object type: {type(py_object)}")
 
-    return glue_value
+    return encoder(py_object)
 
 
 def create_glue_arg(name, py_value):
@@ -447,7 +700,7 @@ def create_glue_arg(name, py_value):
         GlueArg: A GlueArg with the given name and value.
     """
     glue_arg = GlueArg()
-    glue_arg.name = name.encode("utf-8")
+    glue_arg.name = _u8(name)
     glue_arg.value = object_to_glue_value(py_value)
     return glue_arg
 
@@ -466,37 +719,309 @@ def create_args(py_map):
         raise ValueError("Input must be a dictionary.")
 
     glue_args = (GlueArg * len(py_map))()  # Create an array of GlueArg
+    _fill_args(glue_args, py_map)
+    return glue_args
+
+
+def create_args_flat(py_map, schema=None):
+    """
+    Creates an array of GlueArg structures from a flat dictionary of scalars.
+
+    Values are written straight into the GlueArg slots without going through
+    object_to_glue_value. Dictionaries that are not flat, or that do not match
+    the schema, are encoded by create_args instead.
+
+    Args:
+        py_map (dict): A Python dictionary where keys are strings and values are bool, int, float or str.
+        schema (dict, optional): Maps argument names to glue type ids (e.g. GLUE_LONG). Values that
+                                 do not fit their declared type are encoded by create_args.
+
+    Returns:
+        POINTER(GlueArg): A ctypes array of GlueArg structures.
+    """
+    if not isinstance(py_map, dict):
+        raise ValueError("Input must be a dictionary.")
+
+    glue_args = (GlueArg * len(py_map))()
+    if not _fill_args_flat(glue_args, py_map, schema):
+        _fill_args(glue_args, py_map)
+    return glue_args
+
+
+def _fill_args(glue_args, py_map):
     for i, (key, value) in enumerate(py_map.items()):
-        glue_args[i].name = key.encode("utf-8")
+        glue_args[i].name = _u8(key)
         glue_args[i].value = object_to_glue_value(
             value)  # Convert the value to GlueValue
 
-    return glue_args
+
+def _write_bool(glue_value, value):
+    glue_value.data.b = value
+    glue_value.type = GLUE_BOOL
+    glue_value.len = -1
+
+
+def _write_int(glue_value, value):
+    glue_value.data.i = value
+    glue_value.type = GLUE_INT
+    glue_value.len = -1
+
+
+def _write_long(glue_value, value):
+    glue_value.data.l = value
+    glue_value.type = GLUE_LONG
+    glue_value.len = -1
+
+
+def _write_double(glue_value, value):
+    glue_value.data.d = value
+    glue_value.type = GLUE_DOUBLE
+    glue_value.len = -1
+
+
+def _write_string(glue_value, value):
+    glue_value.data.s = value.encode("utf-8")
+    glue_value.type = GLUE_STRING
+    glue_value.len = -1
+
+
+def _write_none(glue_value, value):
+    glue_value.type = GLUE_NONE
+    glue_value.len = -1
+
+
+_SLOT_WRITERS = {
+    GLUE_BOOL: _write_bool,
+    GLUE_INT: _write_int,
+    GLUE_LONG: _write_long,
+    GLUE_DOUBLE: _write_double,
+    GLUE_STRING: _write_string,
+}
+
+# Python scalar type -> glue type id, matching object_to_glue_value
+_FLAT_TYPE_IDS = {
+    bool: GLUE_BOOL,
+    int: GLUE_LONG,
+    float: GLUE_DOUBLE,
+    str: GLUE_STRING,
+}
+
+# Schema type id -> Python types its writer accepts without conversion
+_SCHEMA_TYPES = {
+    GLUE_BOOL: (bool,),
+    GLUE_INT: (int,),
+    GLUE_LONG: (int,),
+    GLUE_DOUBLE: (float, int),
+    GLUE_STRING: (str,),
+}
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+
+def _matches_schema(py_map, schema):
+    for name, value in py_map.items():
+        type_id = schema.get(name)
+        if type(value) not in _SCHEMA_TYPES.get(type_id, ()):
+            return False
+        # c_int assignment silently truncates out-of-range values
+        if type_id == GLUE_INT and not _INT32_MIN <= value <= _INT32_MAX:
+            return False
+    return True
+
+
+# (name, python type) signature -> ((encoded name, writer), ...), or None when
+# the signature is not flat. Streaming pushes reuse a handful of schemas.
+_flat_plans = {}
+_FLAT_PLANS_MAX = 1024
+
+
+def _flat_plan(py_map, schema):
+    if schema is not None:
+        writers = [_SLOT_WRITERS.get(schema.get(name)) for name in py_map]
+        if None in writers:
+            return None
+        return tuple(zip(map(_u8, py_map), writers))
+
+    signature = tuple(zip(py_map, map(type, py_map.values())))
+    try:
+        return _flat_plans[signature]
+    except KeyError:
+        pass
+    type_ids = [_FLAT_TYPE_IDS.get(py_type) for _, py_type in signature]
+    plan = None
+    if None not in type_ids:
+        plan = tuple((_u8(name), _SLOT_WRITERS[type_id])
+                     for (name, _), type_id in zip(signature, type_ids))
+    if len(_flat_plans) >= _FLAT_PLANS_MAX:
+        _flat_plans.clear()
+    _flat_plans[signature] = plan
+    return plan
+
+
+def _fill_args_flat(glue_args, py_map, schema=None):
+    """
+    Populates glue_args from a flat scalar dictionary. Returns False, leaving
+    the slots for _fill_args to overwrite, when py_map does not fit.
+    """
+    if schema is not None and not _matches_schema(py_map, schema):
+        return False
+    plan = _flat_plan(py_map, schema)
+    if plan is None:
+        return False
+    try:
+        for arg, (name, writer), value in zip(glue_args, plan, py_map.values()):
+            arg.name = name
+            # Falsy values are sent as glue_none, like object_to_glue_value
+            (writer if value else _write_none)(arg.value, value)
+    except (TypeError, AttributeError):
+        return False
+    return True
+
+
+# Per-thread free lists of GlueArg arrays, keyed by power-of-two capacity
+_args_pool = local()
+_ARGS_POOL_DEPTH = 4
+
+
+def _acquire_args(py_map, schema=None):
+    """
+    Pooled variant of create_args for calls that hand the arguments to the DLL
+    synchronously. The array may be larger than the map, so the number of
+    populated entries is returned alongside it. Give the array back with
+    _release_args once the DLL call has returned.
+    """
+    if not isinstance(py_map, dict):
+        raise ValueError("Input must be a dictionary.")
+
+    n = len(py_map)
+    capacity = 1 << max(n - 1, 0).bit_length()
+    free_lists = getattr(_args_pool, "free_lists", None)
+    if free_lists is None:
+        free_lists = _args_pool.free_lists = {}
+    free = free_lists.get(capacity)
+    glue_args = free.pop() if free else (GlueArg * capacity)()
+    if not _fill_args_flat(glue_args, py_map, schema):
+        _fill_args(glue_args, py_map)
+    return glue_args, n
+
+
+def _release_args(glue_args):
+    # Zero the slots and drop the buffers they kept alive before reuse
+    ctypes.memset(glue_args, 0, ctypes.sizeof(glue_args))
+    if glue_args._objects:
+        glue_args._objects.clear()
+    free = _args_pool.free_lists.setdefault(len(glue_args), [])
+    if len(free) < _ARGS_POOL_DEPTH:
+        free.append(glue_args)
 
 
 class PayloadPusher:
     def __init__(self, result_endpoint):
         self.result_endpoint = result_endpoint
 
-    def push(self, result_obj):
+    def push(self, result_obj, schema=None):
         """
         Encodes multiple result objects and pushes them as a list of GlueArgs.
 
         Args:
             result_obj (dict): A dictionary where keys are argument names and values are their corresponding data.
+            schema (dict, optional): Glue type ids for flat scalar results, see create_args_flat.
         """
-        glue_args = create_args(
-            result_obj)  # Convert the dictionary to GlueArgs
-        glue_lib.glue_push_payload(
-            self.result_endpoint,
-            # Correctly cast the GlueArg array
-            cast(glue_args, POINTER(GlueArg)),
-            len(result_obj),
-            False
-        )
+        glue_args, args_len = _acquire_args(
+            result_obj, schema)  # Convert the dictionary to GlueArgs
+        try:
+            glue_lib.glue_push_payload(
+                self.result_endpoint,
+                # Correctly cast the GlueArg array
+                cast(glue_args, POINTER(GlueArg)),
+                args_len,
+                False
+            )
+        finally:
+            _release_args(glue_args)
+
+
+# Callback instances kept alive for the DLL, keyed by id() for O(1) removal
+active_callbacks = {}
+callback_lock = Lock()
+
+# Creating a CFUNCTYPE instance allocates a libffi closure, so each callback
+# kind uses a single module-level trampoline. The Python handler is looked up
+# by the integer cookie handed to the DLL at registration time.
+_handlers = {}
+_cookies = itertools.count(1)
+
+
+def _add_handler(handler):
+    with callback_lock:
+        cookie = next(_cookies)
+        _handlers[cookie] = handler
+    return cookie
+
+
+def _remove_handler(cookie):
+    with callback_lock:
+        return _handlers.pop(cookie, None)
+
+
+def _context_trampoline(context_name_ptr, field_path_ptr, value_ptr, cookie):
+    on_update = _handlers.get(cookie)
+    if on_update is None:
+        return
+    context_name = context_name_ptr.decode("utf-8")
+    field_path = field_path_ptr.decode("utf-8")
+    if value_ptr:
+        value = translate_glue_value(value_ptr.contents)
+    else:
+        value = None
+    on_update(context_name, field_path, value)
+
+
+def _endpoint_trampoline(endpoint_name_ptr, cookie, payload_ptr, result_endpoint):
+    argument_handler = _handlers.get(cookie)
+    if argument_handler is None:
+        return
+
+    # Access and decode the payload
+    if payload_ptr:
+        payload = payload_ptr.contents
+        args = [
+            {_name_str(arg.name): translate_glue_value(arg.value)}
+            for arg in payload.args[:payload.args_len]
+        ]
+    else:
+        args = None
+
+    # Call the argument handler with args and a result pusher
+    argument_handler(args, PayloadPusher(result_endpoint))
+
+
+def _invoke_result_trampoline(origin, cookie, payload_ptr):
+    # Results are delivered once, so the handler is released on dispatch
+    result_callback = _remove_handler(cookie)
+    if result_callback is None:
+        return
+
+    result = payload_to_object(payload_ptr.contents) if payload_ptr else None
+    result_callback(result)
+
+
+def _endpoint_status_trampoline(endpoint_name, origin, state, cookie):
+    callback = _handlers.get(cookie)
+    if callback is None:
+        return
+    endpoint_name = endpoint_name.decode('utf-8') if endpoint_name else ""
+    origin = origin.decode('utf-8') if origin else ""
+    callback(endpoint_name, origin, state)
 
 
-context_callback_references = []
+_context_callback = ContextFunction(_context_trampoline)
+_endpoint_callback = InvocationCallback(_endpoint_trampoline)
+_invoke_result_callback = PayloadFunction(_invoke_result_trampoline)
+_endpoint_status_callback = GlueEndpointStatusCallback(
+    _endpoint_status_trampoline)
+# Fire-and-forget invocations pass a NULL result callback
+_NULL_PAYLOAD_FN = cast(None, PayloadFunction)
 
 
 def subscribe_context(context_name, field_path, on_update):
@@ -510,29 +1035,26 @@ def subscribe_context(context_name, field_path, on_update):
 
     Returns:
         callable: A lambda that unsubscribes the callback when called.
-    """
-    def context_callback(context_name_ptr, field_path_ptr, value_ptr, cookie):
-        context_name = context_name_ptr.decode("utf-8")
-        field_path = field_path_ptr.decode("utf-8")
-        if value_ptr:
-            value = translate_glue_value(value_ptr.contents)
-        else:
-            value = None
-        on_update(context_name, field_path, value)
 
-    cxt_callback = ContextFunction(context_callback)
-    context_callback_references.append(cxt_callback)
+    Raises:
+        RuntimeError: If Glue did not create the subscription.
+    """
+    cookie = _add_handler(on_update)
 
     subscription = glue_lib.glue_subscribe_context(
-        context_name.encode("utf-8"),
-        field_path.encode("utf-8"),
-        cxt_callback,
-        None
+        _u8(context_name),
+        _u8(field_path),
+        _context_callback,
+        c_void_p(cookie)
     )
+    if not subscription:
+        _remove_handler(cookie)
+        raise RuntimeError(
+            f"Could not subscribe to {context_name}.{field_path}")
 
     return lambda: (
         glue_lib.glue_destroy_resource(subscription),
-        context_callback_references.remove(cxt_callback)
+        _remove_handler(cookie)
     )
 
 
@@ -545,42 +1067,15 @@ def register_endpoint(endpoint_name, argument_handler):
         argument_handler (callable): A lambda or function that processes decoded arguments
                                      and uses the result pusher to send results.
     """
-
-    def endpoint_callback(endpoint_name_ptr, cookie, payload_ptr, result_endpoint):
-        # Decode the endpoint name
-        endpoint_name = endpoint_name_ptr.decode("utf-8")
-
-        # Access and decode the payload
-        if payload_ptr:
-            payload = payload_ptr.contents
-            args = [
-                {arg.name.decode("utf-8"): translate_glue_value(arg.value)}
-                for arg in payload.args[:payload.args_len]
-            ]
-        else:
-            args = None
-
-        # Create a result pusher for the user
-        payload_pusher = PayloadPusher(result_endpoint)
-
-        # Call the argument handler with args and payload_pusher
-        argument_handler(args, payload_pusher)
-
-    # Register the endpoint using the callback
-    callback_instance = InvocationCallback(endpoint_callback)
+    cookie = _add_handler(argument_handler)
     ptr = glue_lib.glue_register_endpoint(
-        endpoint_name.encode("utf-8"), callback_instance, None)
-    active_callbacks.append(callback_instance)
+        _u8(endpoint_name), _endpoint_callback, c_void_p(cookie))
     return lambda: (
-        active_callbacks.remove(callback_instance),
+        _remove_handler(cookie),
         glue_lib.glue_destroy_resource(ptr)
     )
 
 
-active_callbacks = []
-callback_lock = Lock()
-
-
 def invoke_method(method_name, args, result_callback):
     """
     Simplifies invoking a Glue method by handling argument encoding and result translation.
@@ -591,60 +1086,35 @@ def invoke_method(method_name, args, result_callback):
         result_callback (callable): A callback to handle the translated result.
     """
     # Convert Python args to GlueArgs
-    glue_args = create_args(args)
-
-    # Define the result handler
-    def result_handler(origin, cookie, payload_ptr):
-        # Translate payload to Python-friendly result
-
-        if payload_ptr:
-            payload = payload_ptr.contents
-            result = {
-                arg.name.decode("utf-8"): translate_glue_value(arg.value)
-                for arg in payload.args[:payload.args_len]
-            }
-        else:
-            result = None
-        if result_callback:
-            result_callback(result)
-
-        # Remove callback from active list after execution
-        if result_callback:
-            with callback_lock:
-                if result_handler_instance in active_callbacks:
-                    active_callbacks.remove(result_handler_instance)
+    glue_args, args_len = _acquire_args(args)
 
     if result_callback:
-        # Create the result callback instance
-        result_handler_instance = PayloadFunction(result_handler)
-        # Store the callback reference to ensure it stays alive
-        with callback_lock:
-            active_callbacks.append(result_handler_instance)
+        result_handler_instance = _invoke_result_callback
+        cookie = c_void_p(_add_handler(result_callback))
     else:
-        result_handler_instance = ctypes.cast(None, PayloadFunction)
+        result_handler_instance = _NULL_PAYLOAD_FN
+        cookie = None
 
     # Invoke the method
-    glue_lib.glue_invoke(
-        method_name.encode("utf-8"),
-        cast(glue_args, POINTER(GlueArg)),
-        len(glue_args),
-        result_handler_instance,
-        None
-    )
+    try:
+        glue_lib.glue_invoke(
+            _u8(method_name),
+            cast(glue_args, POINTER(GlueArg)),
+            args_len,
+            result_handler_instance,
+            cookie
+        )
+    finally:
+        _release_args(glue_args)
 
 
 def subscribe_endpoint_status(callback):
-    def endpoint_status_callback(endpoint_name, origin, state, cookie):
-        endpoint_name = endpoint_name.decode('utf-8') if endpoint_name else ""
-        origin = origin.decode('utf-8') if origin else ""
-        callback(endpoint_name, origin, state)
-
-    callback_instance = GlueEndpointStatusCallback(endpoint_status_callback)
-    ptr = glue_lib.glue_subscribe_endpoints_status(callback_instance, None)
-    active_callbacks.append(callback_instance)
+    cookie = _add_handler(callback)
+    ptr = glue_lib.glue_subscribe_endpoints_status(
+        _endpoint_status_callback, c_void_p(cookie))
 
     return lambda: (
-        active_callbacks.remove(callback_instance),
+        _remove_handler(cookie),
         glue_lib.glue_destroy_resource(ptr)
     )
 
@@ -686,10 +1156,10 @@ def initialize_glue(app_name, on_state_change=None):
             loop.call_soon_threadsafe(future.set_result, False)
 
     init_callback = GlueInitCallback(glue_init_callback)
-    active_callbacks.append(init_callback)  # keep alive
+    active_callbacks[id(init_callback)] = init_callback  # keep alive
 
     def cleanup(_):
-        active_callbacks.remove(init_callback)  # cleanup
+        active_callbacks.pop(id(init_callback), None)  # cleanup
 
     future.add_done_callback(cleanup)
 
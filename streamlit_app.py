@@ -6,17 +6,12 @@ Subscribes to SelectedInstrument context and displays the selected stock's price
 """
 
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import altair as alt
+import bisect
+import functools
 import logging
-
-# Install with: pip install streamlit-autorefresh
-try:
-    from streamlit_autorefresh import st_autorefresh
-    HAS_AUTOREFRESH = True
-except ImportError:
-    HAS_AUTOREFRESH = False
+import threading
+import time
+import traceback
 
 # Import gluepy for context sharing
 from gluepy import (
@@ -25,7 +20,8 @@ from gluepy import (
     translate_glue_value,
     GlueState,
     GlueInitCallback,
-    active_callbacks
+    active_callbacks,
+    subscribe_context
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +44,18 @@ st.set_page_config(
 # ═══════════════════════════════════════════════════════════════════════════════
 
 INSTRUMENT_CONTEXT = "SelectedInstrument"
+INSTRUMENT_CONTEXT_BYTES = INSTRUMENT_CONTEXT.encode("utf-8")
+RIC_FIELD_BYTES = b"ric"
+# Only the polling fragment reruns on each tick, not the whole script
+CONTEXT_POLL_SECONDS = 1
+# Safety-net context read interval while subscribed, in case updates stop;
+# also how often a failed subscription is retried
+CONTEXT_RESYNC_SECONDS = 30
+# Minimum gap between context-triggered reruns, so bursts of updates settle
+CONTEXT_RERUN_DEBOUNCE_SECONDS = 0.25
+# How often the sidebar checks on a pending Glue init, and when it gives up
+GLUE_INIT_POLL_SECONDS = 0.5
+GLUE_INIT_TIMEOUT_SECONDS = 30
 DEFAULT_TICKER = "AAPL"
 
 STOCKS = [
@@ -62,6 +70,36 @@ STOCKS = [
     "SPGI", "T", "TJX", "TMO", "TSLA", "TXN", "UNH", "UNP", "UPS", "V",
     "VZ", "WFC", "WM", "WMT", "XOM",
 ]
+SORTED_STOCKS = sorted(set(STOCKS))
+# Symbol -> selectbox index in SORTED_STOCKS
+STOCK_INDEX = {symbol: i for i, symbol in enumerate(SORTED_STOCKS)}
+
+# Time horizon label -> yfinance period
+HORIZONS = {
+    "1 Month": "1mo",
+    "3 Months": "3mo",
+    "6 Months": "6mo",
+    "1 Year": "1y",
+    "5 Years": "5y",
+}
+HORIZON_LABELS = tuple(HORIZONS)
+
+# RIC exchange code -> Yahoo Finance ticker suffix
+EXCHANGE_SUFFIXES = {
+    "LN": ".L",
+    "GR": ".DE",
+    "FP": ".PA",
+    "NA": ".AS",
+    "SM": ".MC",
+    "IM": ".MI",
+    "SW": ".SW",
+    "AV": ".VI",
+    "BB": ".BR",
+    "JP": ".T",
+    "HK": ".HK",
+    "AU": ".AX",
+    "CN": ".TO",
+}
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Session State Initialization
@@ -71,21 +109,48 @@ if 'glue_initialized' not in st.session_state:
     st.session_state.glue_initialized = False
 if 'glue_init_attempted' not in st.session_state:
     st.session_state.glue_init_attempted = False
+if 'glue_init_started_at' not in st.session_state:
+    st.session_state.glue_init_started_at = 0.0
+if 'glue_init_failed' not in st.session_state:
+    st.session_state.glue_init_failed = False
 if 'last_ric' not in st.session_state:
     st.session_state.last_ric = None
 if 'stock_selector' not in st.session_state:
     st.session_state.stock_selector = DEFAULT_TICKER
+if 'context_version' not in st.session_state:
+    st.session_state.context_version = None
+if 'context_read_at' not in st.session_state:
+    st.session_state.context_read_at = 0.0
+if 'context_rerun_at' not in st.session_state:
+    st.session_state.context_rerun_at = 0.0
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# Auto-refresh for context updates (must be early in the script)
+# Glue Context Functions
 # ═══════════════════════════════════════════════════════════════════════════════
 
-if HAS_AUTOREFRESH and st.session_state.glue_initialized:
-    st_autorefresh(interval=1000, limit=None, key="context_autorefresh")
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# Glue Context Functions
-# ═══════════════════════════════════════════════════════════════════════════════
+@st.cache_resource(show_spinner=False)
+def get_context_watch() -> dict:
+    """Process-wide latest value of the SelectedInstrument context.
+
+    A context subscription stores each RIC it delivers and bumps a counter, so
+    pollers can pick up changes without a synchronous CLR read.
+    """
+    watch = {'version': 0, 'ric': None, 'subscribed': False,
+             'created_at': time.monotonic()}
+
+    def on_update(context_name, field_path, value):
+        # Publish the value before the version, so a poller that sees the
+        # new version also sees its RIC
+        watch['ric'] = str(value) if value else None
+        watch['version'] += 1
+
+    try:
+        subscribe_context(INSTRUMENT_CONTEXT, "ric", on_update)
+        watch['subscribed'] = True
+    except Exception as e:
+        logger.warning(f"Could not subscribe to context: {e}")
+    return watch
 
 
 def read_context_ric() -> str:
@@ -93,92 +158,128 @@ def read_context_ric() -> str:
     if not st.session_state.glue_initialized:
         return None
 
+    # Take changes straight from the subscription
+    watch = get_context_watch()
+    now = time.monotonic()
+    if (not watch['subscribed']
+            and now - watch['created_at'] >= CONTEXT_RESYNC_SECONDS):
+        # Drop a failed subscription from the cache so the next poll retries
+        get_context_watch.clear()
+    if watch['subscribed']:
+        if watch['version'] != st.session_state.context_version:
+            st.session_state.context_version = watch['version']
+            if watch['ric']:
+                return watch['ric']
+        # Cross into the CLR once per session, for a value set before the
+        # subscription existed, then only as a slow safety net
+        if now - st.session_state.context_read_at < CONTEXT_RESYNC_SECONDS:
+            return st.session_state.last_ric
+    st.session_state.context_read_at = now
+
     try:
-        ctx_reader = glue_lib.glue_read_context_sync(INSTRUMENT_CONTEXT.encode("utf-8"))
+        ctx_reader = glue_lib.glue_read_context_sync(INSTRUMENT_CONTEXT_BYTES)
         if ctx_reader:
-            ric_value = glue_lib.glue_read_glue_value(ctx_reader, b"ric")
+            ric_value = glue_lib.glue_read_glue_value(ctx_reader, RIC_FIELD_BYTES)
             ric = translate_glue_value(ric_value)
             if ric:
-                return str(ric)
+                ric = str(ric)
+                if (watch['subscribed'] and st.session_state.last_ric
+                        and ric != st.session_state.last_ric):
+                    logger.warning("Context subscription missed an update; resynced")
+                return ric
     except Exception as e:
         logger.debug(f"Could not read context: {e}")
 
     return None
 
 
-# Global to keep callback alive for the lifetime of the app
-_glue_init_callback_ref = None
-_glue_init_event = None
-_glue_init_result = {'success': False}
+@st.cache_resource(show_spinner=False)
+def get_glue_init() -> dict:
+    """Process-wide Glue initialization state, shared across reruns.
 
+    The init callback is created and registered here, once, so retries reuse
+    it instead of adding another entry to active_callbacks each time.
+    """
+    init = {'event': threading.Event(), 'started': False, 'success': False}
 
-def init_glue_sync():
-    """Initialize Glue synchronously for Streamlit."""
-    global _glue_init_callback_ref, _glue_init_event, _glue_init_result
+    def glue_init_callback(state, message, glue_payload, cookie):
+        decoded_message = message.decode('utf-8') if message else ""
+        logger.info(f"Glue callback - state: {state}, message: {decoded_message}")
 
-    if st.session_state.glue_initialized:
-        return True
-
-    # If we already attempted, check if it succeeded in the background
-    if st.session_state.glue_init_attempted:
-        if _glue_init_result.get('success'):
-            st.session_state.glue_initialized = True
-            return True
-        return False
+        # INITIALIZED = 3
+        if state == 3:
+            init['success'] = True
+            init['event'].set()
+        # DISCONNECTED = 4
+        elif state == 4:
+            init['event'].set()
 
-    st.session_state.glue_init_attempted = True
+    # Create callback and keep it alive FOREVER
+    init['callback'] = GlueInitCallback(glue_init_callback)
+    active_callbacks[id(init['callback'])] = init['callback']
+    return init
 
-    try:
-        import threading
 
-        _glue_init_event = threading.Event()
-        _glue_init_result['success'] = False
+def start_glue_init() -> bool:
+    """Start Glue initialization without waiting for it to finish."""
+    init = get_glue_init()
+    if init['success']:
+        st.session_state.glue_initialized = True
+        return True
 
-        def glue_init_callback(state, message, glue_payload, cookie):
-            decoded_message = message.decode('utf-8') if message else ""
-            logger.info(f"Glue callback - state: {state}, message: {decoded_message}")
+    st.session_state.glue_init_attempted = True
+    st.session_state.glue_init_started_at = time.monotonic()
 
-            # INITIALIZED = 3
-            if state == 3:
-                _glue_init_result['success'] = True
-                _glue_init_event.set()
-            # DISCONNECTED = 4
-            elif state == 4:
-                _glue_init_event.set()
+    # Another rerun already has an init in flight; just wait for it
+    if init['started'] and not init['event'].is_set():
+        return True
 
-        # Create callback and keep it alive FOREVER
-        _glue_init_callback_ref = GlueInitCallback(glue_init_callback)
-        active_callbacks.append(_glue_init_callback_ref)
+    try:
+        init['event'].clear()
+        init['success'] = False
 
         logger.info("Calling glue_init...")
-        result = glue_lib.glue_init(b"StockChart", _glue_init_callback_ref, None)
+        result = glue_lib.glue_init(b"StockChart", init['callback'], None)
         logger.info(f"glue_init returned: {result}")
 
         if result != 0:
             logger.error(f"glue_init returned error: {result}")
+            st.session_state.glue_init_attempted = False
             return False
 
-        # Wait for initialization
-        logger.info("Waiting for Glue initialization (30s timeout)...")
-        if _glue_init_event.wait(timeout=30.0):
-            if _glue_init_result['success']:
-                st.session_state.glue_initialized = True
-                logger.info("Glue initialized successfully")
-                return True
-            else:
-                logger.warning("Glue initialization failed")
-                return False
-        else:
-            logger.warning("Glue initialization timed out")
-            return False
+        init['started'] = True
+        return True
 
     except Exception as e:
         logger.error(f"Error initializing Glue: {e}")
-        import traceback
         logger.error(traceback.format_exc())
+        st.session_state.glue_init_attempted = False
         return False
 
 
+@st.fragment(run_every=GLUE_INIT_POLL_SECONDS)
+def wait_for_glue_init():
+    """Check on a pending Glue init; rerun the app once it has settled."""
+    init = get_glue_init()
+    if init['event'].is_set():
+        if init['success']:
+            logger.info("Glue initialized successfully")
+            st.session_state.glue_initialized = True
+        else:
+            logger.warning("Glue initialization failed")
+            st.session_state.glue_init_failed = True
+    elif time.monotonic() - st.session_state.glue_init_started_at > GLUE_INIT_TIMEOUT_SECONDS:
+        logger.warning("Glue initialization timed out")
+        st.session_state.glue_init_failed = True
+    else:
+        st.caption("⏳ Connecting...")
+        return
+
+    st.session_state.glue_init_attempted = False
+    st.rerun()
+
+
+@functools.lru_cache(maxsize=256)
 def ric_to_ticker(ric: str) -> str:
     """Convert a RIC (e.g., VOD:LN) to a Yahoo Finance ticker."""
     if not ric:
@@ -186,48 +287,46 @@ def ric_to_ticker(ric: str) -> str:
 
     ric = ric.upper().strip()
 
-    suffix_map = {
-        ":LN": ".L",
-        ":GR": ".DE",
-        ":FP": ".PA",
-        ":NA": ".AS",
-        ":SM": ".MC",
-        ":IM": ".MI",
-        ":SW": ".SW",
-        ":AV": ".VI",
-        ":BB": ".BR",
-        ":JP": ".T",
-        ":HK": ".HK",
-        ":AU": ".AX",
-        ":CN": ".TO",
-    }
-
-    for ric_suffix, yahoo_suffix in suffix_map.items():
-        if ric.endswith(ric_suffix):
-            base = ric[:-len(ric_suffix)]
-            return base + yahoo_suffix
-
-    if ":" in ric:
-        return ric.split(":")[0]
-
-    return ric
+    # One split and one dict probe, however many exchanges are mapped
+    base, sep, exchange = ric.rpartition(":")
+    if not sep:
+        return ric
+
+    yahoo_suffix = EXCHANGE_SUFFIXES.get(exchange)
+    if yahoo_suffix is not None:
+        return base + yahoo_suffix
+
+    return ric.partition(":")[0]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Check for context updates FIRST (before any UI)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-if st.session_state.glue_initialized:
+
+@st.fragment(run_every=CONTEXT_POLL_SECONDS)
+def poll_context():
+    """Poll the context; rerun the whole app only when the instrument changed."""
+    # Let the previous rerun settle; the next tick picks up any newer context
+    if time.monotonic() - st.session_state.context_rerun_at < CONTEXT_RERUN_DEBOUNCE_SECONDS:
+        return
+
     current_ric = read_context_ric()
     if current_ric and current_ric != st.session_state.last_ric:
         st.session_state.last_ric = current_ric
+        # ric_to_ticker upper-cases its input, so no further case folding
         new_ticker = ric_to_ticker(current_ric)
-        if new_ticker and new_ticker.upper() != st.session_state.stock_selector:
-            st.session_state.stock_selector = new_ticker.upper()
-            st.toast(f"📥 Switched to {new_ticker.upper()}", icon="✅")
+        if new_ticker and new_ticker != st.session_state.stock_selector:
+            st.session_state.stock_selector = new_ticker
+            st.toast(f"📥 Switched to {new_ticker}", icon="✅")
+            st.session_state.context_rerun_at = time.monotonic()
             st.rerun()
 
 
+if st.session_state.glue_initialized:
+    poll_context()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Sidebar - Glue Connection
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -236,35 +335,30 @@ with st.sidebar:
     st.subheader("🔗 io.Connect Integration")
 
     if not st.session_state.glue_initialized:
-        if st.button("Connect to io.Connect", type="primary", width="stretch"):
-            with st.spinner("Connecting..."):
-                if init_glue_sync():
-                    st.rerun()
-                else:
-                    st.error("Failed to connect")
+        if st.session_state.glue_init_attempted:
+            # Init runs in the background; the fragment polls it so the
+            # script thread stays free
+            wait_for_glue_init()
+        elif st.button("Connect to io.Connect", type="primary", width="stretch"):
+            st.session_state.glue_init_failed = False
+            if start_glue_init():
+                st.rerun()
+            st.session_state.glue_init_failed = True
+        if st.session_state.glue_init_failed:
+            st.error("Failed to connect")
     else:
         st.success("✓ Connected")
         st.caption(f"Reading from `{INSTRUMENT_CONTEXT}`")
 
-        if HAS_AUTOREFRESH:
-            st.caption("🔄 Auto-sync enabled (1s)")
-        else:
-            st.warning("Install `streamlit-autorefresh` for auto-sync")
+        st.caption(f"🔄 Auto-sync enabled ({CONTEXT_POLL_SECONDS}s)")
 
     st.divider()
 
     # Time horizon selection
     st.subheader("📅 Time Horizon")
-    horizon_map = {
-        "1 Month": "1mo",
-        "3 Months": "3mo",
-        "6 Months": "6mo",
-        "1 Year": "1y",
-        "5 Years": "5y",
-    }
     horizon = st.radio(
         "Select period",
-        options=list(horizon_map.keys()),
+        options=HORIZON_LABELS,
         index=2,
         label_visibility="collapsed"
     )
@@ -276,17 +370,21 @@ with st.sidebar:
 
 st.title("📈 Stock Price Chart")
 
-# Stock selector - builds options list including current selection
-all_options = sorted(set(STOCKS) | {st.session_state.stock_selector})
-
-# Ensure selected ticker is valid before rendering selectbox
-if st.session_state.stock_selector not in all_options:
-    st.session_state.stock_selector = DEFAULT_TICKER
+# Stock selector - the presorted list, plus the current selection when it
+# came from outside it (e.g. via context)
+selected = st.session_state.stock_selector
+index = STOCK_INDEX.get(selected)
+if index is not None:
+    all_options = SORTED_STOCKS
+else:
+    all_options = SORTED_STOCKS.copy()
+    index = bisect.bisect_left(all_options, selected)
+    all_options.insert(index, selected)
 
 ticker = st.selectbox(
     "Select Stock",
     options=all_options,
-    index=all_options.index(st.session_state.stock_selector),
+    index=index,
 )
 
 # Update session state with selection
@@ -297,34 +395,94 @@ st.session_state.stock_selector = ticker
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-@st.cache_resource(show_spinner=False, ttl="1h")
+@st.cache_resource(show_spinner=False, max_entries=128)
+def get_ticker(ticker: str):
+    """Shared Yahoo Finance client for a ticker (keeps its HTTP session)."""
+    # Deferred so script startup doesn't pay for yfinance and its dependencies
+    import yfinance as yf
+    return yf.Ticker(ticker)
+
+
+@st.cache_data(show_spinner=False, ttl="1h", max_entries=128)
 def load_data(ticker: str, period: str):
     """Load stock data from Yahoo Finance."""
-    stock = yf.Ticker(ticker)
-    data = stock.history(period=period)
+    stock = get_ticker(ticker)
+    # Only Close is used; skip the dividend and split columns
+    data = stock.history(period=period, actions=False)
     if data is None or data.empty:
         return None
-    return data["Close"]
+    # Yahoo often leaves the latest Close empty; the start and end prices
+    # must be real numbers
+    close = data["Close"].dropna()
+    # A ticker with rows but no prices is as good as missing
+    if close.empty:
+        return None
+    # Arrow-backed floats go to the browser without re-encoding. Always
+    # double, even when every price happens to be a whole number
+    return close.astype("double[pyarrow]")
+
+
+@st.cache_data(show_spinner=False, ttl="1h", max_entries=128)
+def load_prepared(ticker: str, period: str):
+    """Close prices with the normalized chart frame, end price and change."""
+    data = load_data(ticker, period)
+    if data is None or data.empty:
+        return None
+
+    start_price = float(data.iloc[0])
+    end_price = float(data.iloc[-1])
+    scale = 100.0 / start_price
+    change_pct = end_price * scale - 100.0
+
+    # Normalize the data (start at 100) with a single scalar multiply
+    chart_data = (
+        (data * scale).rename("Price (Normalized)")
+        .rename_axis("Date")
+        .reset_index()
+    )
+    return data, chart_data, end_price, change_pct
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def chart_spec(ticker: str) -> dict:
+    """Vega-Lite spec for a ticker's normalized price chart, without data."""
+    import altair as alt
+
+    chart = (
+        alt.Chart()
+        .mark_line(color="#1f77b4", strokeWidth=2)
+        .encode(
+            alt.X("Date:T", title="Date"),
+            alt.Y("Price (Normalized):Q", title="Normalized Price (Start = 100)", scale=alt.Scale(zero=False)),
+            tooltip=[
+                alt.Tooltip("Date:T", title="Date"),
+                alt.Tooltip("Price (Normalized):Q", title="Price", format=".2f")
+            ]
+        )
+        .properties(
+            title=f"{ticker} - Normalized Price",
+            height=500
+        )
+    )
+    spec = chart.to_dict()
+    # The frame is passed to st.vega_lite_chart alongside the spec
+    spec.pop("data", None)
+    spec.pop("datasets", None)
+    return spec
 
 
 with st.spinner(f"Loading {ticker} data..."):
     try:
-        data = load_data(ticker, horizon_map[horizon])
+        prepared = load_prepared(ticker, HORIZONS[horizon])
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        data = None
+        prepared = None
 
-if data is None or data.empty:
+if prepared is None:
     st.warning(f"Could not load data for {ticker}. The ticker may not exist in Yahoo Finance.")
     st.stop()
 
-# Normalize the data (start at 100)
-normalized = (data / data.iloc[0]) * 100
-
-# Calculate stats
-start_price = data.iloc[0]
-end_price = data.iloc[-1]
-change_pct = ((end_price - start_price) / start_price) * 100
+data, chart_data, end_price, change_pct = prepared
 
 # Display metrics
 col1, col2, col3 = st.columns(3)
@@ -334,31 +492,9 @@ col3.metric("Period", horizon)
 
 st.divider()
 
-# Create the chart
-chart_data = pd.DataFrame({
-    "Date": normalized.index,
-    "Price (Normalized)": normalized.values
-})
-
-chart = (
-    alt.Chart(chart_data)
-    .mark_line(color="#1f77b4", strokeWidth=2)
-    .encode(
-        alt.X("Date:T", title="Date"),
-        alt.Y("Price (Normalized):Q", title="Normalized Price (Start = 100)", scale=alt.Scale(zero=False)),
-        tooltip=[
-            alt.Tooltip("Date:T", title="Date"),
-            alt.Tooltip("Price (Normalized):Q", title="Price", format=".2f")
-        ]
-    )
-    .properties(
-        title=f"{ticker} - Normalized Price",
-        height=500
-    )
-)
-
-st.altair_chart(chart, width="stretch")
+# Create the chart; only the data changes between reruns
+st.vega_lite_chart(chart_data, chart_spec(ticker), width="stretch")
 
-# Show raw data in expander
-with st.expander("View Raw Data"):
-    st.dataframe(data.tail(20))
+# Show raw data on request; a collapsed expander would still serialize it
+if st.toggle("View Raw Data"):
+    st.dataframe(data.iloc[-20:])